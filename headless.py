@@ -0,0 +1,153 @@
+"""
+Headless snake game for bots and benchmarks
+
+The whole game state lives in NumPy arrays so the per-tick kernel can be
+compiled with Numba; the curses game in main.py is unaffected.
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # run the kernel as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# board cells
+EMPTY = 0
+BODY = 1
+BAIT = 2
+
+# step() results
+MOVED = 0
+ATE = 1
+DIED = 2
+# tick() only: the snake fills the board, leaving no room for bait
+WON = 3
+
+
+@njit(cache=True)
+def step(board, ring, head, tail, dy, dx):
+    """
+    Advance the snake stored in `ring[tail..head]` by one cell
+
+    `ring` is a ring buffer of (y, x) segments, `head` and `tail` index its
+    newest and oldest entries; returns the status and the updated indices.
+    """
+    capacity = ring.shape[0]
+    max_y, max_x = board.shape
+
+    y = ring[head, 0] + dy
+    x = ring[head, 1] + dx
+    if y <= 0 or y >= max_y - 1 or x <= 0 or x >= max_x - 1:
+        return DIED, head, tail
+
+    status = MOVED
+    if board[y, x] == BAIT:
+        status = ATE  # grow by keeping the tail in place
+    else:
+        # the tail moves out of the way before the head moves in
+        board[ring[tail, 0], ring[tail, 1]] = EMPTY
+        tail = (tail + 1) % capacity
+        if board[y, x] == BODY:
+            return DIED, head, tail
+
+    head = (head + 1) % capacity
+    ring[head, 0] = y
+    ring[head, 1] = x
+    board[y, x] = BODY
+    return status, head, tail
+
+
+class HeadlessGame:
+    def __init__(
+        self,
+        height: int = 24,
+        width: int = 80,
+        length: int = 15,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.board = np.zeros((height, width), dtype=np.int8)
+        # a snake can at most fill the board, and int16 holds any terminal
+        # coordinate
+        self.ring = np.empty((height * width, 2), dtype=np.int16)
+        self.direction = (0, 1)
+        self.score = 0
+        self.alive = True
+        self._rand = random.Random(seed)
+
+        # same layout as main.py: a horizontal line below the center
+        y, x = height // 2 + 1, width // 2 + 1
+        for idx in range(length):
+            self.ring[idx] = y, x + idx
+            self.board[y, x + idx] = BODY
+        self.tail = 0
+        self.head = length - 1
+
+        self.place_bait()
+
+    @property
+    def snake_head(self) -> Tuple[int, int]:
+        return int(self.ring[self.head, 0]), int(self.ring[self.head, 1])
+
+    def place_bait(self) -> bool:
+        """Put bait on a random empty cell, False if there is none left"""
+        inside = self.board[1:-1, 1:-1]
+        empty = np.flatnonzero(inside == EMPTY)
+        if not empty.size:
+            self.bait = None
+            return False
+
+        idx = empty[self._rand.randrange(empty.size)]
+        y, x = (int(i) + 1 for i in np.unravel_index(idx, inside.shape))
+        self.board[y, x] = BAIT
+        self.bait = (y, x)
+        return True
+
+    def tick(self, direction: Optional[Tuple[int, int]] = None) -> int:
+        # can't go opposite direction
+        if direction is not None and direction != (
+            -self.direction[0],
+            -self.direction[1],
+        ):
+            self.direction = direction
+
+        status, self.head, self.tail = step(
+            self.board, self.ring, self.head, self.tail, *self.direction
+        )
+        if status == ATE:
+            self.score += 1
+            if not self.place_bait():
+                status = WON
+                self.alive = False
+        elif status == DIED:
+            self.alive = False
+        return status
+
+
+def benchmark(ticks: int = 1_000_000, seed: int = 0) -> float:
+    """Play `ticks` ticks with a random bot, returns ticks per second"""
+    rand = random.Random(seed)
+    directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    game = HeadlessGame(seed=seed)
+    game.tick()  # compile the kernel outside of the measurement
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if not game.alive:
+            game = HeadlessGame(seed=rand.randrange(2**32))
+        game.tick(rand.choice(directions) if rand.random() < 0.2 else None)
+    return ticks / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"{benchmark():,.0f} ticks/s")
@@ -5,31 +5,39 @@ from __future__ import annotations
 
 import curses
 import random
+import sys
 import time
 from collections import deque
 from dataclasses import dataclass
-from typing import Generator, Tuple
+from itertools import islice
+from typing import Generator, Iterator, Optional, Set, Tuple
+
+
+# DEC private mode 2026 (synchronized output): supporting terminals hold
+# the frame until it is complete, others ignore the sequences
+BEGIN_SYNC = "\x1b[?2026h"
+END_SYNC = "\x1b[?2026l"
 
 
 class SnakeDied(Exception):
     ...
 
 
-@dataclass(frozen=True)
-class Coordinate:
-    y: int
-    x: int
+class SnakeWon(Exception):
+    ...
+
+
+class TerminalTooSmall(Exception):
+    ...
+
 
-    @classmethod
-    def from_tuple(cls, tupe: Tuple[int, int]) -> Coordinate:
-        return Coordinate(*tupe)
+# (y, x) pair; plain tuples are cheaper to build, compare and hash than
+# dataclass instances, and snake segments are created every tick
+Coordinate = Tuple[int, int]
 
-    def __add__(self, other: Coordinate) -> Coordinate:
-        return Coordinate(self.y + other.y, self.x + other.x)
 
-    def __iter__(self) -> Generator[int, None, None]:
-        yield self.y
-        yield self.x
+def add(a: Coordinate, b: Coordinate) -> Coordinate:
+    return a[0] + b[0], a[1] + b[1]
 
 
 class Snake:
@@ -40,53 +48,86 @@ class Snake:
     def __init__(self, direction, length: int, position: Coordinate) -> None:
         self.direction = direction
         self.queue = deque(
-            [position + Coordinate(1, i + 1) for i in reversed(range(length))]
+            [add(position, (1, i + 1)) for i in reversed(range(length))]
         )
+        self._occupied: Set[Coordinate] = set(self.queue)
+        self.bitten = False
+        self._grow = 0  # ticks left during which the tail stays put
 
     @property
     def head(self) -> Coordinate:
         return self.queue[0]
 
     @property
-    def body(self) -> Generator[Coordinate, None, None]:
-        for idx, segment in enumerate(self.queue):
-            if idx == 0:
-                continue
-            yield segment
+    def body(self) -> Iterator[Coordinate]:
+        return islice(self.queue, 1, None)
 
     def __iter__(self) -> Generator[Tuple[int, int, str], None, None]:
-        for idx, segment in enumerate(self.queue):
-            if idx == 0:
-                yield segment.y, segment.x, Snake.HEAD
-            else:
-                yield segment.y, segment.x, Snake.BODY
+        y, x = self.queue[0]
+        yield y, x, Snake.HEAD
+        for y, x in self.body:
+            yield y, x, Snake.BODY
 
-    def move(self) -> None:
-        self.queue.pop()
-        self.queue.appendleft(self.queue[0] + self.direction)
+    def move(self) -> Optional[Coordinate]:
+        """Advance the snake, returning the cell it vacated (if any)"""
+        if self._grow:
+            self._grow -= 1
+            tail = None
+        else:
+            tail = self.queue.pop()
+            self._occupied.discard(tail)
 
-    def eat(self, bait: Coordinate) -> None:
-        self.queue.append(bait)
+        y, x = self.queue[0]
+        dy, dx = self.direction
+        new_head = (y + dy, x + dx)
+        self.queue.appendleft(new_head)
 
+        self.bitten = new_head in self._occupied
+        self._occupied.add(new_head)
+        return tail
 
-@dataclass
-class Playground:
-    max_size: Coordinate
+    def eat(self) -> None:
+        self._grow += 1
 
-    @property
-    def origin(self) -> Coordinate:
-        return Coordinate(0, 0)
+
+class Playground:
+    def __init__(self, max_size: Coordinate) -> None:
+        self.max_size = max_size
+        self.origin: Coordinate = (0, 0)
+        self.center: Coordinate = (max_size[0] // 2, max_size[1] // 2)
+        self._rand = random.Random()
+
+        # cells inside the border not covered by the snake; _pos maps a cell
+        # to its index in _free so it can be swap-removed in O(1)
+        self._free = [
+            (y, x)
+            for y in range(1, max_size[0] - 1)
+            for x in range(1, max_size[1] - 1)
+        ]
+        self._pos = {cell: idx for idx, cell in enumerate(self._free)}
 
     @property
-    def center(self) -> Coordinate:
-        return Coordinate(self.max_size.y // 2, self.max_size.x // 2)
+    def is_full(self) -> bool:
+        return not self._free
 
     @property
     def random_point(self) -> Coordinate:
-        return Coordinate(
-            random.randint(1, self.max_size.y - 2),
-            random.randint(1, self.max_size.x - 2),
-        )
+        """A random free cell"""
+        return self._free[self._rand.randrange(len(self._free))]
+
+    def occupy(self, cell: Coordinate) -> None:
+        idx = self._pos.pop(cell, None)
+        if idx is None:  # on the border or already occupied
+            return
+
+        last = self._free.pop()
+        if idx < len(self._free):
+            self._free[idx] = last
+            self._pos[last] = idx
+
+    def release(self, cell: Coordinate) -> None:
+        self._pos[cell] = len(self._free)
+        self._free.append(cell)
 
 
 @dataclass
@@ -95,61 +136,115 @@ class Gameplay:
     playground: Playground
     bait: Coordinate = None
 
-    __current_speed: float = 0.1
-    __current_score: float = 0
-    __SCORE_MULTIPLIER: float = 2
+    speed: float = 0.1
+    score: int = 0
     __SPEED_MULTIPLIER: float = 0.99
 
     DIRECTIONS = {
-        curses.KEY_UP: Coordinate(y=-1, x=0),
-        curses.KEY_DOWN: Coordinate(y=1, x=0),
-        curses.KEY_LEFT: Coordinate(y=0, x=-1),
-        curses.KEY_RIGHT: Coordinate(y=0, x=1),
+        curses.KEY_UP: (-1, 0),
+        curses.KEY_DOWN: (1, 0),
+        curses.KEY_LEFT: (0, -1),
+        curses.KEY_RIGHT: (0, 1),
     }
 
-    @property
-    def speed(self) -> float:
-        return self.__current_speed
+    # values are the very objects stored in DIRECTIONS, so they can be
+    # compared by identity
+    OPPOSITE = {
+        DIRECTIONS[curses.KEY_UP]: DIRECTIONS[curses.KEY_DOWN],
+        DIRECTIONS[curses.KEY_DOWN]: DIRECTIONS[curses.KEY_UP],
+        DIRECTIONS[curses.KEY_LEFT]: DIRECTIONS[curses.KEY_RIGHT],
+        DIRECTIONS[curses.KEY_RIGHT]: DIRECTIONS[curses.KEY_LEFT],
+    }
 
-    @property
-    def score(self) -> int:
-        return self.__current_score
+    def __post_init__(self) -> None:
+        for cell in self.snake.queue:
+            self.playground.occupy(cell)
+
+    def move_snake(self) -> Optional[Coordinate]:
+        # keeps the playground's free cells in sync with the snake
+        tail = self.snake.move()
+        if tail is not None:
+            self.playground.release(tail)
+        self.playground.occupy(self.snake.head)
+        return tail
 
     def check_boundary(self) -> bool:
+        y, x = self.snake.head
+        max_y, max_x = self.playground.max_size
         return (
-            self.snake.head in self.snake.body
-            or self.snake.head.y in (0, self.playground.max_size.y - 1)
-            or self.snake.head.x in (0, self.playground.max_size.x - 1)
+            self.snake.bitten
+            or y == 0
+            or y == max_y - 1
+            or x == 0
+            or x == max_x - 1
         )
 
     def create_bait(self) -> None:
+        # the snake covers the whole board, there is nowhere left for bait
+        if self.playground.is_full:
+            raise SnakeWon
+
         self.bait = self.playground.random_point
 
     def increase_speed(self) -> None:
-        self.__current_speed *= Gameplay.__SPEED_MULTIPLIER
+        self.speed *= Gameplay.__SPEED_MULTIPLIER
 
     def increase_score(self) -> None:
-        self.__current_score = max(
-            1, self.__current_score * Gameplay.__SCORE_MULTIPLIER
-        )
+        self.score += 1
 
     def did_ate_bait(self) -> bool:
         return self.snake.head == self.bait
 
     def is_direction_allowed(self, next_direction: Coordinate) -> bool:
-        if not next_direction:
-            return False
+        return (
+            next_direction is not None
+            and next_direction is not Gameplay.OPPOSITE[self.snake.direction]
+        )
+
+
+def present(*windows: "curses._CursesWindow") -> None:
+    """Flush all pending changes of the windows in a single update"""
+    sys.stdout.write(BEGIN_SYNC)
+    sys.stdout.flush()
+
+    for window in windows:
+        window.noutrefresh()
+    curses.doupdate()
+
+    sys.stdout.write(END_SYNC)
+    sys.stdout.flush()
+
 
-        return next_direction.y != -(
-            self.snake.direction.y
-        ) or next_direction.x != -(self.snake.direction.x)
+def draw_score(window: "curses._CursesWindow", score: int) -> None:
+    _, width = window.getmaxyx()
+    window.hline(0, 0, curses.ACS_HLINE, width)  # part of the border
+    window.addstr(0, 0, f" Score: {score} ")
+
+
+def draw_scene(
+    screen: "curses._CursesWindow",
+    score_window: "curses._CursesWindow",
+    gameplay: Gameplay,
+) -> None:
+    """Draw everything from scratch, and repaint the whole terminal"""
+    screen.erase()
+    screen.addstr(*gameplay.bait, Snake.BAIT)
+    for segment in gameplay.snake:
+        screen.addstr(*segment)
+    # last, in case the head just hit the wall; the border follows the
+    # playground, which keeps its startup size when the terminal grows
+    screen.derwin(*gameplay.playground.max_size, 0, 0).border()
+    draw_score(score_window, gameplay.score)
+
+    screen.redrawwin()
+    score_window.redrawwin()
+    present(screen, score_window)
 
 
 def main(screen: "curses._CursesWindow") -> int:
     curses.curs_set(0)  # hide the cursor
-    screen.nodelay(True)  # don't block i/o calls
 
-    playground = Playground(Coordinate.from_tuple(screen.getmaxyx()))
+    playground = Playground(screen.getmaxyx())
     snake = Snake(
         direction=Gameplay.DIRECTIONS[curses.KEY_RIGHT],
         length=15,
@@ -159,43 +254,96 @@ def main(screen: "curses._CursesWindow") -> int:
     gameplay = Gameplay(snake, playground)
     gameplay.create_bait()
 
-    screen.refresh()
-
+    # the score lives in its own window so updating it leaves the rest of
+    # the top border untouched
+    score_window = curses.newwin(1, 20, 0, 5)
+
+    # the scene is drawn in full only here and when the terminal gets
+    # resized, otherwise just the changed cells are redrawn
+    draw_scene(screen, score_window, gameplay)
+
+    # bind what the loop uses every tick to locals, skipping attribute
+    # lookups on each access
+    addstr = screen.addstr
+    getch = screen.getch
+    timeout = screen.timeout
+    perf_counter = time.perf_counter
+    queue = snake.queue
+    directions = Gameplay.DIRECTIONS
+    check_boundary = gameplay.check_boundary
+    did_ate_bait = gameplay.did_ate_bait
+    move_snake = gameplay.move_snake
+    is_direction_allowed = gameplay.is_direction_allowed
+
+    tail = None
     try:
         while True:
-            screen.erase()
-            screen.border()
-
-            screen.addstr(*Coordinate(0, 5), f" Score: {gameplay.score} ")
-            screen.addstr(*gameplay.bait, Snake.BAIT)
+            # the tick lasts `speed` seconds no matter how long the frame
+            # takes to update and draw
+            deadline = perf_counter() + gameplay.speed
 
-            if gameplay.check_boundary():
+            if check_boundary():
                 raise SnakeDied
 
-            if gameplay.did_ate_bait():
-                snake.eat(gameplay.bait)
+            # blank the vacated cell first, the new bait may be placed on it
+            if tail is not None:
+                addstr(*tail, " ")
+
+            if did_ate_bait():
+                snake.eat()
+                gameplay.increase_score()
                 gameplay.create_bait()
                 gameplay.increase_speed()
-                gameplay.increase_score()
 
-            for segment in snake:
-                screen.addstr(*segment)
+                draw_score(score_window, gameplay.score)
+                addstr(*gameplay.bait, Snake.BAIT)
+
+            addstr(*queue[1], Snake.BODY)
+            addstr(*queue[0], Snake.HEAD)
+
+            tail = move_snake()
+            present(screen, score_window)
+
+            # wait for a key for the rest of the tick, getch() returns -1
+            # when none was pressed
+            timeout(max(0, int((deadline - perf_counter()) * 1000)))
+            key = getch()
+            if key == curses.KEY_RESIZE:
+                # curses has already resized the screen to the terminal
+                max_y, max_x = screen.getmaxyx()
+                if (
+                    max_y < playground.max_size[0]
+                    or max_x < playground.max_size[1]
+                ):
+                    raise TerminalTooSmall
+                draw_scene(screen, score_window, gameplay)
+
+            # a key press ends the wait early, sleep off what is left
+            remaining = deadline - perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
 
-            snake.move()
-            next_direction = Gameplay.DIRECTIONS.get(screen.getch(), None)
+            next_direction = directions.get(key, None)
 
             # can't go opposite direction
-            if gameplay.is_direction_allowed(next_direction):
+            if is_direction_allowed(next_direction):
                 snake.direction = next_direction
 
-            screen.refresh()
-            time.sleep(gameplay.speed)
-
     except SnakeDied:
         screen.erase()
         screen.addstr(
             *playground.center, f"Snake died at {gameplay.score} points"
         )
+    except SnakeWon:
+        screen.erase()
+        screen.addstr(
+            *playground.center, f"Snake won with {gameplay.score} points"
+        )
+    except TerminalTooSmall:
+        # the playground no longer fits, write where it is sure to be seen
+        _, max_x = screen.getmaxyx()
+        screen.erase()
+        screen.addnstr(0, 0, "TERMINAL TOO SMALL, QUITTING...", max_x - 1)
     except KeyboardInterrupt:
         screen.erase()
         screen.addstr(*playground.center, "QUITTING...")